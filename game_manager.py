@@ -1,8 +1,32 @@
 import random
 import string
+import time
 import asyncio
+import logging
+import orjson
+from collections import deque
 from typing import Dict, List, Optional, Any
 from enum import Enum
+from operator import attrgetter
+
+DEFAULT_AVATAR = '👤'
+ROOM_ID_ALPHABET = string.ascii_uppercase + string.digits
+BROADCAST_BATCH_SIZE = 50  # Per-viewer emits gathered at once before yielding to the event loop
+BROADCAST_DEBOUNCE = 0.01  # Seconds to wait so a burst of mutations shares one room:state
+CHAT_FLUSH_INTERVAL = 0.05  # Seconds chat messages are buffered before going out as one chat:batch
+IDLE_ROOM_TIMEOUT = 3600  # Seconds without player activity before the janitor destroys a room
+JANITOR_INTERVAL = 300  # Seconds between idle-room sweeps
+START_FAILED_MESSAGE = '게임을 시작할 수 없습니다. 3명 이상 참여, 모든 일반 플레이어 준비 완료 필요'
+
+logger = logging.getLogger(__name__)
+
+class GameError(Exception):
+    """Expected rule or precondition failure, reported to the client as a room:error"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
 
 class GamePhase(Enum):
     LOBBY = "lobby"
@@ -10,51 +34,183 @@ class GamePhase(Enum):
     PHASE2_SELLING = "phase2_selling"
     GAME_OVER = "game_over"
 
+# Integer mirrors of GamePhase for the per-action validation checks
+PHASE_LOBBY = 0
+PHASE_BID = 1
+PHASE_SELL = 2
+PHASE_OVER = 3
+PHASE_CODES = {
+    GamePhase.LOBBY: PHASE_LOBBY,
+    GamePhase.PHASE1_BIDDING: PHASE_BID,
+    GamePhase.PHASE2_SELLING: PHASE_SELL,
+    GamePhase.GAME_OVER: PHASE_OVER
+}
+
 class Player:
+    __slots__ = (
+        'sid', 'nickname', 'ready', 'coins', 'properties', 'properties_set', 'property_count',
+        'cheques', 'cheque_count', 'total_cheque_value', 'current_bid', 'has_passed', 'selected_property', '_view'
+    )
+
     def __init__(self, sid: str, nickname: str):
         self.sid = sid
         self.nickname = nickname
         self.ready = False
         self.coins = 18000  # Starting coins
         self.properties = []  # Property cards owned
+        self.properties_set = set()  # Same cards as properties, for O(1) membership checks
+        self.property_count = 0
         self.cheques = []  # Money cheques earned
+        self.cheque_count = 0
+        self.total_cheque_value = 0  # Running sum of cheques, maintained by add_cheque
         self.current_bid = 0
         self.has_passed = False
         self.selected_property = None  # For Phase 2 - property card selected for this round
+        # Public view sent in room:state, kept in sync whenever the fields above change
+        self._view = {
+            'id': sid,
+            'nickname': nickname,
+            'avatar': DEFAULT_AVATAR,
+            'isReady': False,
+            'isHost': False,
+            'coins': self.coins,
+            'propertyCount': 0,
+            'chequeCount': 0,
+            'currentBid': 0,
+            'hasPassed': False,
+            'isCurrentTurn': False,
+            'properties': [],  # Private - only filled in the owner's own copy
+            'cheques': [],  # Private - only filled in the owner's own copy
+            'totalChequeValue': 0,
+            'selectedProperty': None,
+            'hasSelected': False
+        }
+
+    def set_ready(self, ready: bool):
+        self.ready = ready
+        self._view['isReady'] = ready
+
+    def set_bid(self, amount: int):
+        self.current_bid = amount
+        self._view['currentBid'] = amount
+
+    def set_passed(self, passed: bool):
+        self.has_passed = passed
+        self._view['hasPassed'] = passed
+
+    def pay(self, amount: int):
+        """Spend coins (winning bid or pass penalty) and keep the public view in sync"""
+        self.coins -= amount
+        self._view['coins'] = self.coins
+
+    def add_property(self, card: int):
+        """Take a property card and keep the count and public view in sync"""
+        self.properties.append(card)
+        self.properties_set.add(card)
+        self.property_count += 1
+        self._view['propertyCount'] = self.property_count
+
+    def remove_property(self, card: int):
+        """Give up a property card (Phase 2 sale) and keep the count and public view in sync"""
+        self.properties.remove(card)
+        self.properties_set.discard(card)
+        self.property_count -= 1
+        self._view['propertyCount'] = self.property_count
+
+    def add_cheque(self, value: int):
+        """Take a cheque and keep the running total and public view in sync"""
+        self.cheques.append(value)
+        self.cheque_count += 1
+        self.total_cheque_value += value
+        self._view['chequeCount'] = self.cheque_count
+        self._view['totalChequeValue'] = self.total_cheque_value
 
 class Room:
+    __slots__ = (
+        'room_id', 'players', 'host_sid', 'phase', 'phase_code', 'phase_value', 'game_state',
+        'property_deck', 'cheque_deck', 'current_properties', 'current_cheques', 'total_properties_in_hand',
+        'current_bid', 'current_high_bidder', 'turn_order', 'current_sid', 'active_sids',
+        'next_active', 'prev_active', 'round_number', 'turn_timer_handle', 'turn_timeout',
+        'selected_count', 'phase2_round_number', 'last_round_winner', 'seq', 'dirty',
+        '_flush_scheduled', 'action_queue', 'consumer_task', 'last_state_bytes', 'last_activity',
+        'chat_buffer', '_chat_flush_scheduled'
+    )
+
     def __init__(self, room_id: str, creator_sid: str, creator_nickname: str):
         self.room_id = room_id
         self.players: Dict[str, Player] = {}
+        self.host_sid = creator_sid  # Creator is the host for the room's lifetime
         self.phase = GamePhase.LOBBY
+        self.phase_code = PHASE_LOBBY
+        self.phase_value = self.phase.value  # Cached strings for room:state, updated with phase
+        self.game_state = 'lobby'
         self.property_deck = list(range(1, 31))  # Cards 1-30
         self.cheque_deck = [0, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000, 11000, 12000, 13000, 15000]  # No 1000 and 14000
-        self.current_properties = []  # Properties on table
+        self.current_properties = deque()  # Properties on table, sorted ascending
         self.current_cheques = []  # Cheques on table
+        self.total_properties_in_hand = 0  # Property cards held by all players combined
         self.current_bid = 0
         self.current_high_bidder = None
         self.turn_order = []
-        self.current_turn_index = 0
+        self.current_sid = None  # Player whose turn it is
+        self.active_sids = set()  # Players still bidding in the current Phase 1 round
+        # Ring over the round's turn order; passing players are spliced out but keep their own links
+        self.next_active: Dict[str, str] = {}
+        self.prev_active: Dict[str, str] = {}
         self.round_number = 1
-        self.turn_timer_task = None  # Asyncio task for turn timer
+        self.turn_timer_handle = None  # asyncio.TimerHandle for the current turn
         self.turn_timeout = 30  # 30 seconds per turn
-        self.phase2_selections = {}  # Track Phase 2 card selections {player_sid: card_value}
+        self.selected_count = 0  # Players who have picked a card this Phase 2 round (see Player.selected_property)
         self.phase2_round_number = 1  # Track Phase 2 round separately
         self.last_round_winner = None  # Track winner of last round to determine next round's starting player
+        # Bumped on game-flow mutations (phase changes, bids, passes, picks, Phase 2 rounds) - not on
+        # lobby join/ready or departures. Clients echo it back with bids and passes.
+        self.seq = 0
+        self.dirty = False  # State changed since the last room:state broadcast
+        self._flush_scheduled = False  # A coalesced broadcast is queued on the event loop
+        self.action_queue = asyncio.Queue()  # (handler, args, future) processed by the room consumer
+        self.consumer_task = None
+        self.last_state_bytes: Dict[str, bytes] = {}  # Last room:state sent to each player, serialized
+        self.last_activity = time.monotonic()  # Last player action, used by the idle-room janitor
+        self.chat_buffer: List[Dict[str, Any]] = []  # Chat messages waiting for the next chat:batch
+        self._chat_flush_scheduled = False
         
         # Add creator as first player
         creator = Player(creator_sid, creator_nickname)
+        creator._view['isHost'] = True
         self.players[creator_sid] = creator
         
         # Shuffle decks
         random.shuffle(self.property_deck)
         random.shuffle(self.cheque_deck)
+        # Cards are dealt from the front, so keep the shuffled decks as deques
+        self.property_deck = deque(self.property_deck)
+        self.cheque_deck = deque(self.cheque_deck)
+
+    def cleanup(self):
+        """Cancel the turn timer and drop player/card references once the room is destroyed"""
+        if self.turn_timer_handle:
+            self.turn_timer_handle.cancel()
+            self.turn_timer_handle = None
+        self.players.clear()
+        self.turn_order.clear()
+        self.active_sids.clear()
+        self.next_active.clear()
+        self.prev_active.clear()
+        self.property_deck.clear()
+        self.cheque_deck.clear()
+        self.current_properties.clear()
+        self.current_cheques.clear()
+        self.last_state_bytes.clear()
+        self.chat_buffer.clear()
 
 class GameManager:
     def __init__(self):
         self.rooms: Dict[str, Room] = {}
-        self.player_to_room: Dict[str, str] = {}
+        self.sid_to_room: Dict[str, Room] = {}  # Only holds rooms that are still in self.rooms
         self.sio = None  # Will be set by main.py
+        self._background_tasks = set()  # Keep references to in-flight broadcasts and timeouts
+        self._janitor_task = None  # Started with the first room, once an event loop is running
 
     def set_sio(self, sio):
         """Set the socket.io instance for broadcasting"""
@@ -63,79 +219,218 @@ class GameManager:
     async def _start_turn_timer(self, room: Room):
         """Start a timer for the current player's turn"""
         # Cancel existing timer if any
-        if room.turn_timer_task:
-            room.turn_timer_task.cancel()
+        self._cancel_turn_timer(room)
         
         # Verify current player hasn't passed
-        if room.turn_order and room.current_turn_index < len(room.turn_order):
-            current_player_sid = room.turn_order[room.current_turn_index]
-            player = room.players.get(current_player_sid)
+        if room.current_sid:
+            player = room.players.get(room.current_sid)
             
             if player and player.has_passed:
-                print(f"⚠️ Warning: Trying to start timer for {player.nickname} who already passed!")
+                logger.warning("⚠️ Trying to start timer for %s who already passed!", player.nickname)
                 # Force move to next turn
                 has_active = await self._next_turn(room)
                 if has_active:
-                    print(f"✓ Moved to next active player")
-                    if self.sio:
-                        await self.broadcast_state(room.room_id, self.sio)
+                    logger.debug("✓ Moved to next active player")
+                    self._mark_dirty(room)
                     # Restart timer for the correct player
                     await self._start_turn_timer(room)
                     return
                 else:
-                    print(f"⚠️ No active players found, ending round")
+                    logger.warning("⚠️ No active players found, ending round")
                     await self._end_phase1_round(room)
-                    if self.sio:
-                        await self.broadcast_state(room.room_id, self.sio)
+                    self._mark_dirty(room)
                     return
         
-        # Create new timer task
-        async def timer_expired():
-            try:
-                await asyncio.sleep(room.turn_timeout)
-                # Time's up - auto pass for current player
-                if room.phase == GamePhase.PHASE1_BIDDING:
-                    current_player_sid = room.turn_order[room.current_turn_index]
-                    player = room.players.get(current_player_sid)
-                    
-                    if player:
-                        if not player.has_passed:
-                            print(f"⏰ Timer expired for player {player.nickname}, auto-passing")
-                            await self.handle_pass(current_player_sid)
-                            if self.sio:
-                                await self.broadcast_state(room.room_id, self.sio)
-                        else:
-                            # Player has already passed but is still current turn - force next turn
-                            print(f"⚠️ Timer expired but player {player.nickname} already passed, forcing next turn")
-                            has_active = await self._next_turn(room)
-                            
-                            if has_active:
-                                # Found next active player, restart timer
-                                await self._start_turn_timer(room)
-                                if self.sio:
-                                    await self.broadcast_state(room.room_id, self.sio)
-                            else:
-                                # No active players, end round
-                                print("⚠️ No active players found, ending round")
-                                self._cancel_turn_timer(room)
-                                await self._end_phase1_round(room)
-                                if self.sio:
-                                    await self.broadcast_state(room.room_id, self.sio)
-            except asyncio.CancelledError:
-                pass
-            except Exception as e:
-                print(f"Error in timer_expired: {e}")
+        # A plain TimerHandle in the loop's heap; no task exists until it actually fires
+        room.turn_timer_handle = asyncio.get_running_loop().call_later(
+            room.turn_timeout, self._fire_turn_timeout, room, room.seq)
+
+    def _fire_turn_timeout(self, room: Room, seq: int):
+        room.turn_timer_handle = None
+        task = asyncio.create_task(self._run_turn_timeout(room, seq))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _run_turn_timeout(self, room: Room, seq: int):
+        if self.rooms.get(room.room_id) is not room:
+            return  # Destroyed between the timer firing and this task starting
+        try:
+            # Time's up - run the expiry through the room's action queue like any other action
+            await self._submit(room, self._on_turn_timeout, room, seq)
+        except Exception as e:
+            logger.exception("Error in turn timeout: %s", e)
+
+    async def _on_turn_timeout(self, room: Room, seq: int):
+        """Auto-pass for the current player when their turn timer runs out"""
+        if room.phase_code != PHASE_BID:
+            return
+        if room.seq != seq:
+            return  # Someone acted while the expiry was waiting in the queue
         
-        room.turn_timer_task = asyncio.create_task(timer_expired())
+        current_player_sid = room.current_sid
+        player = room.players.get(current_player_sid)
+        if not player:
+            return
+        
+        if not player.has_passed:
+            logger.info("⏰ Timer expired for player %s, auto-passing", player.nickname)
+            await self._handle_pass(current_player_sid)
+        else:
+            # Player has already passed but is still current turn - force next turn
+            logger.warning("⚠️ Timer expired but player %s already passed, forcing next turn", player.nickname)
+            has_active = await self._next_turn(room)
+            
+            if has_active:
+                # Found next active player, restart timer
+                await self._start_turn_timer(room)
+                self._mark_dirty(room)
+            else:
+                # No active players, end round
+                logger.warning("⚠️ No active players found, ending round")
+                self._cancel_turn_timer(room)
+                await self._end_phase1_round(room)
+                self._mark_dirty(room)
 
     def _cancel_turn_timer(self, room: Room):
         """Cancel the current turn timer"""
-        if room.turn_timer_task:
-            room.turn_timer_task.cancel()
-            room.turn_timer_task = None
+        if room.turn_timer_handle:
+            room.turn_timer_handle.cancel()
+            room.turn_timer_handle = None
+
+    async def _room_consumer(self, room: Room):
+        """Run queued actions for one room strictly one at a time, so no locks are needed"""
+        while True:
+            handler, args, future = await room.action_queue.get()
+            try:
+                result = await handler(*args)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_result(None)
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                # The submitter may have been cancelled (e.g. a turn timer replaced by this action)
+                if not future.done():
+                    future.set_result(result)
+
+    async def _submit(self, room: Room, handler, *args):
+        """Queue an action on the room's consumer and wait for its result"""
+        if room.consumer_task is None:
+            return None  # Consumer already stopped - nothing would ever run this
+        future = asyncio.get_running_loop().create_future()
+        room.action_queue.put_nowait((handler, args, future))
+        return await future
+
+    async def _submit_for(self, sid: str, handler, *args):
+        room = self.sid_to_room.get(sid)
+        if room is None:
+            return None
+        room.last_activity = time.monotonic()
+        return await self._submit(room, handler, *args)
+
+    def _stop_consumer(self, room: Room):
+        """Stop the room's consumer and release anyone still waiting on a queued action"""
+        self._cancel_turn_timer(room)
+        if room.consumer_task:
+            room.consumer_task.cancel()
+            room.consumer_task = None
+        while not room.action_queue.empty():
+            _, _, future = room.action_queue.get_nowait()
+            if not future.done():
+                future.set_result(None)
+
+    async def _janitor(self):
+        """Periodically destroy rooms nobody has acted in for IDLE_ROOM_TIMEOUT seconds"""
+        while True:
+            await asyncio.sleep(JANITOR_INTERVAL)
+            now = time.monotonic()
+            stale = [room for room in self.rooms.values() if now - room.last_activity > IDLE_ROOM_TIMEOUT]
+            for room in stale:
+                logger.info("🧹 Destroying idle room %s", room.room_id)
+                try:
+                    await self._destroy_room(room, '오랫동안 활동이 없어 방이 파괴되었습니다.')
+                except Exception as e:
+                    logger.exception("Error destroying idle room %s: %s", room.room_id, e)
+
+    async def _destroy_room(self, room: Room, message: str):
+        """Tear the room down, then tell whoever is still in it"""
+        # await 전에 모든 정리를 끝내서 동시 disconnect와 경합하지 않도록 함
+        room_id = room.room_id
+        self.rooms.pop(room_id, None)
+        self._stop_consumer(room)
+        for other_sid in room.players:
+            self.sid_to_room.pop(other_sid, None)
+        room.cleanup()
+        if self.sio:
+            await self.sio.emit('room:destroyed', {'message': message}, room=room_id)
+
+    def _mark_dirty(self, room: Room):
+        """Schedule one room:state broadcast covering every mutation made within BROADCAST_DEBOUNCE"""
+        room.dirty = True
+        if room._flush_scheduled or not self.sio:
+            return
+        room._flush_scheduled = True
+        asyncio.get_running_loop().call_later(BROADCAST_DEBOUNCE, self._do_flush, room)
+
+    def _do_flush(self, room: Room):
+        room._flush_scheduled = False
+        if not room.dirty:
+            return  # Already sent by a direct broadcast_state call
+        # Through the room queue, so the snapshot can't overtake room:delta events from the consumer
+        task = asyncio.create_task(self._submit(room, self._flush_dirty, room))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _flush_dirty(self, room: Room):
+        if room.dirty and self.sio:
+            await self.broadcast_state(room.room_id, self.sio)
+
+    def queue_chat(self, room: Room, chat_data: Dict[str, Any]):
+        """Buffer a chat message; the room's buffer goes out as one chat:batch after CHAT_FLUSH_INTERVAL"""
+        room.last_activity = time.monotonic()
+        room.chat_buffer.append(chat_data)
+        if room._chat_flush_scheduled or not self.sio:
+            return
+        room._chat_flush_scheduled = True
+        asyncio.get_running_loop().call_later(CHAT_FLUSH_INTERVAL, self._flush_chat, room)
+
+    def _flush_chat(self, room: Room):
+        room._chat_flush_scheduled = False
+        if not room.chat_buffer or room.room_id not in self.rooms:
+            return
+        messages = room.chat_buffer
+        room.chat_buffer = []
+        task = asyncio.create_task(self.sio.emit('chat:batch', messages, room=room.room_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def schedule_broadcast(self, room_id: str):
+        """Queue a debounced room:state broadcast for a room (used by the socket handlers)"""
+        room = self.rooms.get(room_id)
+        if room is not None:
+            self._mark_dirty(room)
+
+    async def _check_seq(self, room: Room, sid: str, client_seq: Optional[int]) -> bool:
+        """Reject actions made against a stale state and resync the sender with a full snapshot"""
+        if client_seq is None or client_seq == room.seq:
+            return True
+        logger.info("🔁 Stale action from %s (seq %s != %s), resyncing", sid, client_seq, room.seq)
+        if self.sio:
+            await self.send_state(room.room_id, sid, self.sio)
+        return False
+
+    def _set_phase(self, room: Room, phase: GamePhase):
+        """Change the room phase and refresh the cached strings sent in room:state"""
+        room.phase = phase
+        room.phase_code = PHASE_CODES[phase]
+        room.seq += 1
+        room.phase_value = phase.value
+        room.game_state = 'lobby' if phase is GamePhase.LOBBY else 'playing'
 
     def _generate_room_id(self) -> str:
-        return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        return ''.join(random.choices(ROOM_ID_ALPHABET, k=6))
 
     async def create_room(self, sid: str, nickname: str) -> str:
         room_id = self._generate_room_id()
@@ -143,212 +438,219 @@ class GameManager:
             room_id = self._generate_room_id()
         
         room = Room(room_id, sid, nickname)
+        room.consumer_task = asyncio.create_task(self._room_consumer(room))
         self.rooms[room_id] = room
-        self.player_to_room[sid] = room_id
+        self.sid_to_room[sid] = room
+        if self._janitor_task is None:
+            self._janitor_task = asyncio.create_task(self._janitor())
         
         return room_id
 
-    async def join_room(self, sid: str, room_id: str, nickname: str) -> bool:
-        if room_id not in self.rooms:
-            return False
-        
-        room = self.rooms[room_id]
+    async def join_room(self, sid: str, room_id: str, nickname: str):
+        room = self.rooms.get(room_id)
+        if room is None:
+            raise GameError('JOIN_FAILED', 'Could not join room')
         
         if len(room.players) >= 6:
-            return False
+            raise GameError('JOIN_FAILED', 'Could not join room')
         
-        if room.phase != GamePhase.LOBBY:
-            return False
+        if room.phase_code != PHASE_LOBBY:
+            raise GameError('JOIN_FAILED', 'Could not join room')
         
         player = Player(sid, nickname)
         room.players[sid] = player
-        self.player_to_room[sid] = room_id
-        
-        return True
+        self.sid_to_room[sid] = room
+        room.last_activity = time.monotonic()
 
     async def set_player_ready(self, sid: str, ready: bool) -> Optional[str]:
-        room_id = self.player_to_room.get(sid)
-        if not room_id or room_id not in self.rooms:
+        room = self.sid_to_room.get(sid)
+        if room is None:
             return None
-        
-        room = self.rooms[room_id]
+        room_id = room.room_id
+        room.last_activity = time.monotonic()
         if sid in room.players:
-            room.players[sid].ready = ready
+            room.players[sid].set_ready(ready)
         
         return room_id
 
     async def start_game(self, sid: str) -> Optional[str]:
-        room_id = self.player_to_room.get(sid)
-        if not room_id or room_id not in self.rooms:
-            return None
-        
-        room = self.rooms[room_id]
+        if sid not in self.sid_to_room:
+            raise GameError('START_FAILED', START_FAILED_MESSAGE)
+        return await self._submit_for(sid, self._start_game, sid)
+
+    async def handle_bid(self, sid: str, amount: int, client_seq: Optional[int] = None) -> Optional[str]:
+        return await self._submit_for(sid, self._handle_bid, sid, amount, client_seq)
+
+    async def handle_pass(self, sid: str, client_seq: Optional[int] = None) -> Optional[str]:
+        return await self._submit_for(sid, self._handle_pass, sid, client_seq)
+
+    async def handle_play_card(self, sid: str, card_id: int) -> Optional[str]:
+        return await self._submit_for(sid, self._handle_play_card, sid, card_id)
+
+    async def _start_game(self, sid: str) -> Optional[str]:
+        room = self.sid_to_room.get(sid)
+        if room is None:
+            raise GameError('START_FAILED', START_FAILED_MESSAGE)
+        room_id = room.room_id
         
         # 3명 이상 필요
         if len(room.players) < 3:
-            return None
+            raise GameError('START_FAILED', START_FAILED_MESSAGE)
         
-        # 호스트만 시작 가능 (첫 번째 플레이어)
-        first_player_sid = next(iter(room.players.keys())) if room.players else None
-        if sid != first_player_sid:
-            return None
+        # 호스트만 시작 가능 (방을 만든 플레이어)
+        if sid != room.host_sid:
+            raise GameError('START_FAILED', START_FAILED_MESSAGE)
         
         # 호스트를 제외한 모든 플레이어가 준비 완료되어야 함
-        non_host_players = [p for p_sid, p in room.players.items() if p_sid != first_player_sid]
-        if not all(p.ready for p in non_host_players):
-            return None
+        if not all(p.ready for p_sid, p in room.players.items() if p_sid != room.host_sid):
+            raise GameError('START_FAILED', START_FAILED_MESSAGE)
         
         await self._start_phase1(room)
         return room_id
 
     async def _start_phase1(self, room: Room):
-        print(f"▶️ Starting Phase 1 round {room.round_number}")
-        room.phase = GamePhase.PHASE1_BIDDING
+        logger.info("▶️ Starting Phase 1 round %s", room.round_number)
+        self._set_phase(room, GamePhase.PHASE1_BIDDING)
         # Only shuffle turn order if not already set (first round)
         if not room.turn_order:
             room.turn_order = list(room.players.keys())
             random.shuffle(room.turn_order)
-            print(f"🔀 Initial turn order: {[room.players[sid].nickname for sid in room.turn_order]}")
+            logger.debug("🔀 Initial turn order: %s", room.turn_order)
         elif room.last_round_winner and room.last_round_winner in room.turn_order:
             # Reorder turn_order to start with last round's winner
             winner_index = room.turn_order.index(room.last_round_winner)
             room.turn_order = room.turn_order[winner_index:] + room.turn_order[:winner_index]
-            print(f"🔀 Reordered turn order (winner starts): {[room.players[sid].nickname for sid in room.turn_order]}")
+            logger.debug("🔀 Reordered turn order (winner starts): %s", room.turn_order)
         
-        room.current_turn_index = 0
+        room.current_sid = room.turn_order[0]
+        room.active_sids = set(room.turn_order)
+        room.next_active = {}
+        room.prev_active = {}
+        for i, turn_sid in enumerate(room.turn_order):
+            room.next_active[turn_sid] = room.turn_order[(i + 1) % len(room.turn_order)]
+            room.prev_active[turn_sid] = room.turn_order[i - 1]
         
         # Deal properties equal to number of players
         num_players = len(room.players)
-        room.current_properties = sorted(room.property_deck[:num_players])
-        room.property_deck = room.property_deck[num_players:]
-        print(f"🏠 Dealt properties: {room.current_properties}")
-        print(f"📦 Properties remaining in deck: {len(room.property_deck)}")
+        dealt = [room.property_deck.popleft() for _ in range(num_players)]
+        dealt.sort()
+        room.current_properties = deque(dealt)  # Lowest goes to passers, highest to the winner
+        logger.debug("🏠 Dealt properties: %s", dealt)
+        logger.debug("📦 Properties remaining in deck: %d", len(room.property_deck))
         
         # Reset bidding state
         room.current_bid = 0
         room.current_high_bidder = None
         for player in room.players.values():
-            player.current_bid = 0
-            player.has_passed = False
-        print(f"✅ Reset all players: has_passed=False, current_bid=0")
+            player.set_bid(0)
+            player.set_passed(False)
+        logger.debug("✅ Reset all players: has_passed=False, current_bid=0")
         
         # Start turn timer for first player
-        first_player = room.players[room.turn_order[0]]
-        print(f"⏰ Starting turn timer for {first_player.nickname}")
+        first_player = room.players[room.current_sid]
+        logger.debug("⏰ Starting turn timer for %s", first_player.nickname)
         await self._start_turn_timer(room)
+        
+        # Broadcast the freshly dealt round
+        self._mark_dirty(room)
 
-    async def handle_bid(self, sid: str, amount: int) -> Optional[str]:
-        room_id = self.player_to_room.get(sid)
-        if not room_id or room_id not in self.rooms:
+    async def _handle_bid(self, sid: str, amount: int, client_seq: Optional[int] = None) -> Optional[str]:
+        room = self.sid_to_room.get(sid)
+        if room is None:
             return None
+        room_id = room.room_id
         
-        room = self.rooms[room_id]
+        if room.phase_code != PHASE_BID:
+            raise GameError('BID_FAILED', 'Bidding is not open')
         
-        if room.phase != GamePhase.PHASE1_BIDDING:
+        if not await self._check_seq(room, sid, client_seq):
             return None
         
-        if room.turn_order[room.current_turn_index] != sid:
-            return None
+        if room.current_sid != sid:
+            raise GameError('BID_FAILED', 'Not your turn')
         
         player = room.players[sid]
         
         if player.has_passed:
-            return None
+            raise GameError('BID_FAILED', 'Already passed this round')
         
         if amount <= room.current_bid:
-            return None
+            raise GameError('BID_FAILED', 'Bid must be higher than the current bid')
         
         if amount > player.coins:
-            return None
+            raise GameError('BID_FAILED', 'Not enough coins')
         
         # Valid bid
-        player.current_bid = amount
+        player.set_bid(amount)
         room.current_bid = amount
         room.current_high_bidder = sid
+        room.seq += 1
         
-        print(f"💰 {player.nickname} bid {amount}")
+        logger.debug("💰 %s bid %s", player.nickname, amount)
         
         # Check if only one player remains (all others have passed)
-        active_players = [p for p in room.players.values() if not p.has_passed]
-        print(f"📊 Active players remaining: {len(active_players)}/{len(room.players)}")
-        for p in room.players.values():
-            print(f"  - {p.nickname}: has_passed={p.has_passed}, current_bid={p.current_bid}")
-        
-        if len(active_players) == 1:
-            # Last player gets highest property and pays full bid
-            last_player = active_players[0]
-            
-            # Safety check: ensure there are properties available
-            if not room.current_properties:
-                print(f"⚠️ ERROR: No properties available for last player {last_player.nickname}!")
-                self._cancel_turn_timer(room)
-                await self._end_phase1_round(room)
-                return room_id
-            
-            highest_property = max(room.current_properties)
-            room.current_properties.remove(highest_property)
-            last_player.properties.append(highest_property)
-            bid_paid = last_player.current_bid
-            last_player.coins -= last_player.current_bid
-            last_player.current_bid = 0
-            
-            print(f"🏆 {last_player.nickname} wins the round! Got property {highest_property}, paid {bid_paid}")
-            
-            # Store the winner of this round
-            for player_sid, p in room.players.items():
-                if p == last_player:
-                    room.last_round_winner = player_sid
-                    break
-            
-            # Cancel timer - round is over
-            self._cancel_turn_timer(room)
-            
-            # End of round
-            await self._end_phase1_round(room)
+        logger.debug("📊 Active players remaining: %d/%d", len(room.active_sids), len(room.players))
+        if logger.isEnabledFor(logging.DEBUG):
+            for p in room.players.values():
+                logger.debug("  - %s: has_passed=%s, current_bid=%s", p.nickname, p.has_passed, p.current_bid)
+        
+        if len(room.active_sids) == 1:
+            await self._award_round_to_last_bidder(room)
         else:
             # Move to next active player
             has_active = await self._next_turn(room)
             
             if has_active:
+                # Only the bid changed - send a delta instead of a full snapshot
+                if self.sio:
+                    await self.broadcast_delta(room_id, 'bid', {
+                        'sid': sid,
+                        'amount': amount,
+                        'nextTurn': room.current_sid
+                    }, self.sio)
                 # Restart timer for next player
                 await self._start_turn_timer(room)
             else:
                 # No active players left (shouldn't happen in normal flow, but handle it)
-                print("⚠️ Warning: No active players found after bid, ending round")
+                logger.warning("⚠️ No active players found after bid, ending round")
                 self._cancel_turn_timer(room)
                 await self._end_phase1_round(room)
         
         return room_id
 
-    async def handle_pass(self, sid: str) -> Optional[str]:
-        room_id = self.player_to_room.get(sid)
-        if not room_id or room_id not in self.rooms:
+    async def _handle_pass(self, sid: str, client_seq: Optional[int] = None) -> Optional[str]:
+        room = self.sid_to_room.get(sid)
+        if room is None:
             return None
+        room_id = room.room_id
         
-        room = self.rooms[room_id]
+        if room.phase_code != PHASE_BID:
+            raise GameError('PASS_FAILED', 'Bidding is not open')
         
-        if room.phase != GamePhase.PHASE1_BIDDING:
+        if not await self._check_seq(room, sid, client_seq):
             return None
         
-        if room.turn_order[room.current_turn_index] != sid:
-            return None
+        if room.current_sid != sid:
+            raise GameError('PASS_FAILED', 'Not your turn')
         
         player = room.players[sid]
         
         if player.has_passed:
-            return None
+            raise GameError('PASS_FAILED', 'Already passed this round')
         
         # Player passes - takes lowest property and pays penalty based on current bid
-        player.has_passed = True
+        player.set_passed(True)
+        self._unlink_active(room, sid)
+        room.seq += 1
         
         # Safety check: ensure there are properties available
         if not room.current_properties:
-            print(f"⚠️ ERROR: No properties available when {player.nickname} tried to pass!")
+            logger.error("⚠️ No properties available when %s tried to pass!", player.nickname)
             return None
         
-        lowest_property = min(room.current_properties)
-        room.current_properties.remove(lowest_property)
-        player.properties.append(lowest_property)
+        lowest_property = room.current_properties.popleft()
+        player.add_property(lowest_property)
+        room.total_properties_in_hand += 1
         
         # Calculate penalty: floor(currentBid / 2 / 1000) * 1000 is the refund, rest is penalty
         # Example: 3000 bid -> refund = floor(1500 / 1000) * 1000 = 1000, penalty = 2000
@@ -358,299 +660,378 @@ class GameManager:
             refund = (player.current_bid // 2 // 1000) * 1000
             penalty = player.current_bid - refund
         
-        player.coins -= penalty
-        player.current_bid = 0
+        player.pay(penalty)
+        player.set_bid(0)
         
-        print(f"🚫 {player.nickname} passed. Got property {lowest_property}, paid penalty {penalty}")
+        logger.debug("🚫 %s passed. Got property %s, paid penalty %s", player.nickname, lowest_property, penalty)
         
         # Check if only one player remains
-        active_players = [p for p in room.players.values() if not p.has_passed]
-        print(f"📊 Active players remaining: {len(active_players)}/{len(room.players)}")
-        for p in room.players.values():
-            print(f"  - {p.nickname}: has_passed={p.has_passed}, current_bid={p.current_bid}")
-        
-        if len(active_players) == 1:
-            # Last player gets highest property and pays full bid
-            last_player = active_players[0]
-            
-            # Safety check: ensure there are properties available
-            if not room.current_properties:
-                print(f"⚠️ ERROR: No properties available for last player {last_player.nickname}!")
-                self._cancel_turn_timer(room)
-                await self._end_phase1_round(room)
-                return room_id
-            
-            highest_property = max(room.current_properties)
-            room.current_properties.remove(highest_property)
-            last_player.properties.append(highest_property)
-            bid_paid = last_player.current_bid
-            last_player.coins -= last_player.current_bid
-            last_player.current_bid = 0
-            
-            print(f"🏆 {last_player.nickname} wins the round! Got property {highest_property}, paid {bid_paid}")
-            
-            # Store the winner of this round (the last remaining player)
-            # Find the player's sid
-            for player_sid, p in room.players.items():
-                if p == last_player:
-                    room.last_round_winner = player_sid
-                    break
-            
-            # Cancel timer - round is over
-            self._cancel_turn_timer(room)
-            
-            # End of round
-            await self._end_phase1_round(room)
+        logger.debug("📊 Active players remaining: %d/%d", len(room.active_sids), len(room.players))
+        if logger.isEnabledFor(logging.DEBUG):
+            for p in room.players.values():
+                logger.debug("  - %s: has_passed=%s, current_bid=%s", p.nickname, p.has_passed, p.current_bid)
+        
+        if len(room.active_sids) == 1:
+            await self._award_round_to_last_bidder(room)
         else:
             # Continue with next player
             has_active = await self._next_turn(room)
             
             if has_active:
+                # Only the passing player changed - send a delta instead of a full snapshot
+                if self.sio:
+                    await self.broadcast_delta(room_id, 'pass', {
+                        'sid': sid,
+                        'property': lowest_property,
+                        'penalty': penalty,
+                        'nextTurn': room.current_sid
+                    }, self.sio)
                 # Restart timer for next player
                 await self._start_turn_timer(room)
             else:
                 # Safety check: no active players found
-                print("⚠️ Warning: No active players found after pass, ending round")
+                logger.warning("⚠️ No active players found after pass, ending round")
                 self._cancel_turn_timer(room)
                 await self._end_phase1_round(room)
         
         return room_id
 
+    async def _award_round_to_last_bidder(self, room: Room):
+        """The last player still bidding takes the highest card for their full bid; the round ends"""
+        last_player_sid = next(iter(room.active_sids))
+        last_player = room.players[last_player_sid]
+        
+        # Safety check: ensure there are properties available
+        if not room.current_properties:
+            logger.error("⚠️ No properties available for last player %s!", last_player.nickname)
+            self._cancel_turn_timer(room)
+            await self._end_phase1_round(room)
+            return
+        
+        highest_property = room.current_properties.pop()
+        last_player.add_property(highest_property)
+        room.total_properties_in_hand += 1
+        bid_paid = last_player.current_bid
+        last_player.pay(bid_paid)
+        last_player.set_bid(0)
+        
+        logger.info("🏆 %s wins the round! Got property %s, paid %s", last_player.nickname, highest_property, bid_paid)
+        
+        # Store the winner of this round
+        room.last_round_winner = last_player_sid
+        
+        # Cancel timer - round is over
+        self._cancel_turn_timer(room)
+        
+        # End of round
+        await self._end_phase1_round(room)
+
+    def _unlink_active(self, room: Room, sid: str):
+        """Splice a player out of the active ring in O(1)"""
+        if sid not in room.active_sids:
+            return
+        room.active_sids.discard(sid)
+        prev_sid = room.prev_active[sid]
+        next_sid = room.next_active[sid]
+        room.next_active[prev_sid] = next_sid
+        room.prev_active[next_sid] = prev_sid
+
     async def _next_turn(self, room: Room) -> bool:
-        # Find next active player
-        print(f"🔄 Looking for next active player...")
-        attempts = 0
-        start_index = room.current_turn_index
-        while attempts < len(room.turn_order):
-            room.current_turn_index = (room.current_turn_index + 1) % len(room.turn_order)
-            current_player_sid = room.turn_order[room.current_turn_index]
-            current_player = room.players[current_player_sid]
-            
-            print(f"  Checking {current_player.nickname} (has_passed={current_player.has_passed})")
-            
-            if not current_player.has_passed:
-                print(f"✅ Next turn: {current_player.nickname}")
-                return True  # Found an active player
-            
-            attempts += 1
+        # Follow the ring to the next active player
+        if not room.active_sids:
+            logger.warning("⚠️ No active players left in the turn ring")
+            return False
         
-        # No active player found (all have passed)
-        print(f"⚠️ No active players found after checking all {len(room.turn_order)} players")
-        return False
+        next_sid = room.next_active[room.current_sid]
+        # Only walks further if the current player was spliced out after its successor left
+        while next_sid not in room.active_sids:
+            next_sid = room.next_active[next_sid]
+        room.current_sid = next_sid
+        logger.debug("✅ Next turn: %s", next_sid)
+        return True  # Found an active player
 
     async def _end_phase1_round(self, room: Room):
-        print(f"🏁 Phase 1 round {room.round_number} ended")
-        print(f"📦 Properties remaining in deck: {len(room.property_deck)}, Players: {len(room.players)}")
+        logger.info("🏁 Phase 1 round %s ended", room.round_number)
+        logger.debug("📦 Properties remaining in deck: %d, Players: %d", len(room.property_deck), len(room.players))
         
-        # Broadcast current state before transitioning
-        if self.sio:
-            await self.broadcast_state(room.room_id, self.sio)
+        # Broadcast current state before transitioning; sent directly because a queued
+        # flush would sit behind this handler until the pause is over
+        room.dirty = True
+        await self._flush_dirty(room)
         
         # Wait a moment for players to see the results
-        print(f"⏳ Waiting 2 seconds before starting next round...")
+        logger.debug("⏳ Waiting 2 seconds before starting next round...")
         await asyncio.sleep(2)
         
         # Check if more rounds needed
         if len(room.property_deck) >= len(room.players):
             # Start next round
             room.round_number += 1
-            print(f"▶️ Starting Phase 1 round {room.round_number}")
             await self._start_phase1(room)
-            
-            # Broadcast state for new round
-            if self.sio:
-                await self.broadcast_state(room.room_id, self.sio)
         else:
             # Move to Phase 2
-            print(f"🎯 Moving to Phase 2 (not enough properties left)")
+            logger.info("🎯 Moving to Phase 2 (not enough properties left)")
             await self._start_phase2(room)
 
     async def _start_phase2(self, room: Room):
-        room.phase = GamePhase.PHASE2_SELLING
+        self._set_phase(room, GamePhase.PHASE2_SELLING)
         room.phase2_round_number = 1
         # Deal cheques equal to number of players
         num_players = len(room.players)
-        room.current_cheques = sorted(room.cheque_deck[:num_players], reverse=True)
-        room.cheque_deck = room.cheque_deck[num_players:]
+        dealt = [room.cheque_deck.popleft() for _ in range(num_players)]
+        dealt.sort(reverse=True)
+        room.current_cheques = dealt
         
         # Reset for card selection
-        room.phase2_selections = {}
+        room.selected_count = 0
         for player in room.players.values():
             player.selected_property = None
         
         # Broadcast state to show Phase 2 has started
-        if self.sio:
-            await self.broadcast_state(room.room_id, self.sio)
+        self._mark_dirty(room)
 
-    async def handle_play_card(self, sid: str, card_id: int) -> Optional[str]:
-        room_id = self.player_to_room.get(sid)
-        if not room_id or room_id not in self.rooms:
+    async def _handle_play_card(self, sid: str, card_id: int) -> Optional[str]:
+        room = self.sid_to_room.get(sid)
+        if room is None:
             return None
+        room_id = room.room_id
         
-        room = self.rooms[room_id]
-        
-        if room.phase != GamePhase.PHASE2_SELLING:
-            return None
+        if room.phase_code != PHASE_SELL:
+            raise GameError('PLAY_FAILED', 'Cards can only be played while selling')
         
+        # No seq check: everyone picks at once from the same snapshot, so picks never conflict
         player = room.players[sid]
         
-        if card_id not in player.properties:
-            return None
+        if card_id not in player.properties_set:
+            raise GameError('PLAY_FAILED', 'You do not own that card')
         
         if player.selected_property is not None:  # Already selected a card
-            return None
+            raise GameError('PLAY_FAILED', 'Already selected a card this round')
         
         player.selected_property = card_id  # Store selected card
-        room.phase2_selections[sid] = card_id
+        room.selected_count += 1
+        room.seq += 1
         
         # Broadcast state to show player has selected (without revealing the card)
-        if self.sio:
-            await self.broadcast_state(room.room_id, self.sio)
+        self._mark_dirty(room)
         
         # Check if all players have selected
-        if len(room.phase2_selections) == len(room.players):
+        if room.selected_count == len(room.players):
             await self._resolve_phase2(room)
         
         return room_id
 
     async def _resolve_phase2(self, room: Room):
         # Sort players by selected card value (descending)
-        player_cards = [(sid, player.selected_property) for sid, player in room.players.items()]
-        player_cards.sort(key=lambda x: x[1], reverse=True)
+        players_sorted = sorted(room.players.values(), key=attrgetter('selected_property'), reverse=True)
         
-        # Broadcast state to show all revealed cards (all_selected=True will show all cards)
-        if self.sio:
-            await self.broadcast_state(room.room_id, self.sio)
+        # Broadcast state to show all revealed cards (all_selected=True will show all cards);
+        # sent directly, as a queued flush would wait out the pause below
+        room.dirty = True
+        await self._flush_dirty(room)
         
         # Wait a moment for players to see the reveal
         await asyncio.sleep(2)
         
         # Distribute cheques
-        for i, (sid, card_value) in enumerate(player_cards):
-            player = room.players[sid]
-            player.properties.remove(card_value)
-            player.cheques.append(room.current_cheques[i])
+        for i, player in enumerate(players_sorted):
+            card_value = player.selected_property
+            player.remove_property(card_value)
+            player.add_cheque(room.current_cheques[i])
             player.selected_property = None
         
+        room.total_properties_in_hand -= len(players_sorted)
+        
         # Clear selections for next round
-        room.phase2_selections = {}
+        room.selected_count = 0
+        room.seq += 1
         
         # Broadcast state to show cheque distribution results
-        if self.sio:
-            await self.broadcast_state(room.room_id, self.sio)
+        self._mark_dirty(room)
         
         # Check if game over or continue
-        if any(len(p.properties) > 0 for p in room.players.values()) and len(room.cheque_deck) >= len(room.players):
+        if room.total_properties_in_hand > 0 and len(room.cheque_deck) >= len(room.players):
             # Continue to next Phase 2 round
             room.phase2_round_number += 1
             num_players = len(room.players)
-            room.current_cheques = sorted(room.cheque_deck[:num_players], reverse=True)
-            room.cheque_deck = room.cheque_deck[num_players:]
+            dealt = [room.cheque_deck.popleft() for _ in range(num_players)]
+            dealt.sort(reverse=True)
+            room.current_cheques = dealt
             
             # Broadcast state for next round
-            if self.sio:
-                await self.broadcast_state(room.room_id, self.sio)
+            self._mark_dirty(room)
         else:
             # Game over - calculate final scores
-            room.phase = GamePhase.GAME_OVER
+            self._set_phase(room, GamePhase.GAME_OVER)
             
             # Broadcast final state
-            if self.sio:
-                await self.broadcast_state(room.room_id, self.sio)
+            self._mark_dirty(room)
 
     async def handle_disconnect(self, sid: str, sio):
-        room_id = self.player_to_room.get(sid)
-        if room_id and room_id in self.rooms:
-            room = self.rooms[room_id]
-            
-            # 호스트가 나가는 경우 (첫 번째 플레이어)
-            first_player_sid = next(iter(room.players.keys())) if room.players else None
-            is_host_leaving = sid == first_player_sid
-            
-            # 플레이어가 존재하는지 확인
-            player_exists = sid in room.players
-            
-            if player_exists:
-                # 플레이어 삭제 전에 체크
-                will_be_empty = len(room.players) <= 1
-                
-                # 플레이어 삭제
-                del room.players[sid]
-                
-                if will_be_empty or is_host_leaving:
-                    # 방 파괴 - 모든 플레이어에게 알림
-                    await sio.emit('room:destroyed', {'message': '호스트가 나가서 방이 파괴되었습니다.'}, room=room_id)
-                    del self.rooms[room_id]
-                else:
-                    # 남은 플레이어들에게 상태 업데이트
-                    await self.broadcast_state(room_id, sio)
+        room = self.sid_to_room.pop(sid, None)
+        if room is None:
+            return
         
-        if sid in self.player_to_room:
-            del self.player_to_room[sid]
+        # 게임 상태 변경은 다른 액션과 같은 큐에서 처리 (진행 중인 핸들러의 sleep 도중 끼어들지 않도록)
+        if await self._submit(room, self._remove_player, room, sid):
+            # 방 파괴 후 모든 플레이어에게 알림 - 큐 밖에서 해야 consumer를 멈출 수 있음
+            await self._destroy_room(room, '호스트가 나가서 방이 파괴되었습니다.')
+
+    async def _remove_player(self, room: Room, sid: str) -> bool:
+        """Drop a departed player from the game state; True when the room should be destroyed"""
+        # 플레이어 삭제 (존재하지 않으면 할 일 없음)
+        player = room.players.pop(sid, None)
+        if player is None:
+            return False
+        self._unlink_active(room, sid)
+        room.last_state_bytes.pop(sid, None)
+        room.total_properties_in_hand -= player.property_count
+        if player.selected_property is not None:
+            room.selected_count -= 1
+        
+        # 호스트가 나가거나 마지막 플레이어가 나가는 경우
+        if sid == room.host_sid or not room.players:
+            return True
+        
+        # 남은 플레이어들에게 상태 업데이트
+        self._mark_dirty(room)
+        return False
+
+    async def broadcast_delta(self, room_id: str, event_name: str, payload: Dict[str, Any], sio):
+        """Send only the fields changed by a single action to everyone in the room"""
+        if room_id not in self.rooms:
+            return
+        
+        delta = {'event': event_name, 'seq': self.rooms[room_id].seq}
+        delta.update(payload)
+        await sio.emit('room:delta', delta, room=room_id)
+
+    async def send_state(self, room_id: str, viewer_sid: str, sio):
+        """Send a full state snapshot to a single player (initial sync / resync)"""
+        room = self.rooms.get(room_id)
+        if not room or viewer_sid not in room.players:
+            return
+        
+        public_state = self._build_public_state(room)
+        if room.phase_code == PHASE_OVER:
+            state = self._reveal_all_state(public_state, room)
+        else:
+            index = list(room.players).index(viewer_sid)
+            state = self._personalize_state(public_state, index, room.players[viewer_sid])
+        room.last_state_bytes[viewer_sid] = orjson.dumps(state)
+        await sio.emit('room:state', state, room=viewer_sid)
 
     async def broadcast_state(self, room_id: str, sio):
         if room_id not in self.rooms:
             return
         
         room = self.rooms[room_id]
+        room.dirty = False
         
-        # Get first player (creator) as host
-        first_player_sid = next(iter(room.players.keys())) if room.players else None
+        # Snapshot player IDs; a disconnect can run while the emits below are awaited
+        player_sids = tuple(room.players)
         
-        # Check if all players have selected their cards in Phase 2
-        all_selected = len(room.phase2_selections) == len(room.players) if room.phase == GamePhase.PHASE2_SELLING else False
-        
-        # Create a list of player IDs to avoid dictionary changed size during iteration error
-        player_sids = list(room.players.keys())
-        
-        # Send individual state to each player
-        for viewer_sid in player_sids:
-            # Create player list with privacy handling
-            players_list = []
-            for i, (sid, p) in enumerate(room.players.items()):
-                # Calculate total cheque value
-                total_cheque_value = sum(p.cheques)
-                
-                # Determine what to show for selectedProperty
-                # Only show if: it's the viewer's own card, OR all players have selected
-                selected_property = None
-                if sid == viewer_sid or all_selected:
-                    selected_property = p.selected_property
-                
-                players_list.append({
-                    'id': sid,
-                    'nickname': p.nickname,
-                    'avatar': f'👤',  # Default avatar
-                    'isReady': p.ready,
-                    'isHost': sid == first_player_sid,
-                    'coins': p.coins,
-                    'propertyCount': len(p.properties),
-                    'properties': p.properties if sid == viewer_sid else [],  # Only show own properties
-                    'chequeCount': len(p.cheques),
-                    'cheques': p.cheques if sid == viewer_sid else [],  # Only show own cheques
-                    'totalChequeValue': total_cheque_value,
-                    'currentBid': p.current_bid,
-                    'hasPassed': p.has_passed,
-                    'isCurrentTurn': room.turn_order and len(room.turn_order) > room.current_turn_index and room.turn_order[room.current_turn_index] == sid,
-                    'selectedProperty': selected_property,  # Privacy: only own card or after reveal
-                    'hasSelected': p.selected_property is not None  # Phase 2: whether player has selected
-                })
+        # Everything except the viewer's own cards is shared, so build it once
+        public_state = self._build_public_state(room)
+        
+        # Game over: scoring is public, so every hand is revealed in one shared payload
+        if room.phase_code == PHASE_OVER:
+            public_state = self._reveal_all_state(public_state, room)
+            shared = True
+        else:
+            # Nobody holds private cards: one payload, one emit to the whole room.
+            # The lobby never has any, so skip the per-player scan there.
+            shared = room.phase_code == PHASE_LOBBY or not any(
+                p.property_count or p.cheque_count or p.selected_property != p._view['selectedProperty']
+                for p in room.players.values())
+        
+        if shared:
+            payload = orjson.dumps(public_state)
+            if all(room.last_state_bytes.get(viewer_sid) == payload for viewer_sid in player_sids):
+                return
+            for viewer_sid in player_sids:
+                room.last_state_bytes[viewer_sid] = payload
+            await sio.emit('room:state', public_state, room=room_id)
+            return
+        
+        # Send individual state to each player, emitting concurrently
+        emits = []
+        for index, viewer_sid in enumerate(player_sids):
+            player = room.players.get(viewer_sid)
+            if not player:
+                continue
+            state = self._personalize_state(public_state, index, player)
             
-            # Create state object for this specific viewer
-            state = {
-                'roomId': room_id,
-                'gameState': 'lobby' if room.phase == GamePhase.LOBBY else 'playing',
-                'phase': room.phase.value,
-                'players': players_list,
-                'currentProperties': room.current_properties,
-                'currentCheques': room.current_cheques,
-                'currentBid': room.current_bid,
-                'currentHighBidder': room.current_high_bidder,
-                'currentTurn': room.turn_order[room.current_turn_index] if room.turn_order and len(room.turn_order) > room.current_turn_index else None,
-                'roundNumber': room.round_number,
-                'phase2RoundNumber': room.phase2_round_number,
-                'allPlayersSelected': all_selected
-            }
+            # Skip players whose view is byte-for-byte what they already have
+            payload = orjson.dumps(state)
+            if room.last_state_bytes.get(viewer_sid) == payload:
+                continue
+            room.last_state_bytes[viewer_sid] = payload
             
             # Send to specific player
-            await sio.emit('room:state', state, room=viewer_sid)
\ No newline at end of file
+            emits.append(sio.emit('room:state', state, room=viewer_sid))
+        
+        for start in range(0, len(emits), BROADCAST_BATCH_SIZE):
+            await asyncio.gather(*emits[start:start + BROADCAST_BATCH_SIZE])
+            await asyncio.sleep(0)
+
+    def _build_public_state(self, room: Room) -> Dict[str, Any]:
+        """Build the state every player may see; player entries are the cached public views"""
+        # Check if all players have selected their cards in Phase 2
+        all_selected = room.selected_count == len(room.players) if room.phase_code == PHASE_SELL else False
+        
+        current_turn_sid = room.current_sid
+        
+        players_list = []
+        for sid, p in room.players.items():
+            view = p._view
+            view['isCurrentTurn'] = sid == current_turn_sid
+            # Privacy: selected cards are only public after everyone has selected
+            view['selectedProperty'] = p.selected_property if all_selected else None
+            view['hasSelected'] = p.selected_property is not None  # Phase 2: whether player has selected
+            # Copied so the payload can't change between encoding and the deferred emit
+            players_list.append(dict(view))
+        
+        return {
+            'roomId': room.room_id,
+            'gameState': room.game_state,
+            'phase': room.phase_value,
+            'players': players_list,
+            'currentProperties': list(room.current_properties),
+            'currentCheques': list(room.current_cheques),
+            'currentBid': room.current_bid,
+            'currentHighBidder': room.current_high_bidder,
+            'currentTurn': current_turn_sid,
+            'roundNumber': room.round_number,
+            'phase2RoundNumber': room.phase2_round_number,
+            'allPlayersSelected': all_selected,
+            'seq': room.seq
+        }
+
+    def _reveal_all_state(self, public_state: Dict[str, Any], room: Room) -> Dict[str, Any]:
+        """Copy of the public state with every player's cards shown, for the final scoreboard"""
+        players_list = []
+        for view in public_state['players']:
+            player = room.players[view['id']]
+            view = dict(view)
+            view['properties'] = list(player.properties)
+            view['cheques'] = list(player.cheques)
+            players_list.append(view)
+        
+        state = dict(public_state)
+        state['players'] = players_list
+        return state
+
+    def _personalize_state(self, public_state: Dict[str, Any], index: int, player: Player) -> Dict[str, Any]:
+        """Shallow copy of the public state where the viewer's own entry shows their cards"""
+        own_view = dict(public_state['players'][index])
+        own_view['properties'] = list(player.properties)
+        own_view['cheques'] = list(player.cheques)
+        own_view['selectedProperty'] = player.selected_property
+        
+        players_list = list(public_state['players'])
+        players_list[index] = own_view
+        
+        state = dict(public_state)
+        state['players'] = players_list
+        return state
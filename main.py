@@ -1,15 +1,61 @@
 import socketio
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from game_manager import GameManager
+from game_manager import GameManager, GameError
 import uvicorn
+import atexit
+import logging
+import logging.handlers
 import os
+import queue
+import sys
+import time
+
+_time_ns = time.time_ns  # Chat timestamps, in epoch milliseconds
+
+# Handlers only enqueue records; a listener thread does the stdout writes off the event loop
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.root.setLevel(os.environ.get("LOG_LEVEL", "WARNING").upper())
+logger = logging.getLogger(__name__)
+
+# Constant room:error payloads, built once instead of per failed request
+ERR_INVALID_NICK = {'code': 'INVALID_DATA', 'message': 'Nickname required'}
+ERR_INVALID_JOIN = {'code': 'INVALID_DATA', 'message': 'Room ID and nickname required'}
+ERR_INVALID_BID = {'code': 'INVALID_BID', 'message': 'Bid amount required'}
+ERR_INVALID_CARD = {'code': 'INVALID_CARD', 'message': 'Card ID required'}
+ERR_INVALID_SEQ = {'code': 'INVALID_DATA', 'message': 'seq must be an integer'}
+
+class OrjsonModule:
+    """json-module stand-in so Socket.IO/Engine.IO encode packets with orjson"""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        # orjson already emits compact separators; extra json.dumps kwargs are ignored
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
 
 # Create Socket.IO server
+# WebSocket only: no long-polling handshake/upgrade requests. Hosts that cannot hold a
+# WebSocket open (e.g. Vercel functions) can set SOCKETIO_ALLOW_POLLING=1 to get the fallback back.
+_allow_polling = os.getenv("SOCKETIO_ALLOW_POLLING") == "1"
 sio = socketio.AsyncServer(
     async_mode='asgi',
-    cors_allowed_origins=["*"]
+    cors_allowed_origins=["*"],
+    json=OrjsonModule,
+    transports=['polling', 'websocket'] if _allow_polling else ['websocket'],
+    allow_upgrades=_allow_polling
 )
+_emit = sio.emit  # Bound once; the handlers below call it on every event
 
 # Create FastAPI app
 app = FastAPI()
@@ -26,6 +72,8 @@ app.add_middleware(
 # Create game manager
 game_manager = GameManager()
 game_manager.set_sio(sio)
+# GameManager only mutates this dict in place, so the handlers can hold it directly
+_sid_to_room = game_manager.sid_to_room
 
 # Combine FastAPI and Socket.IO
 socket_app = socketio.ASGIApp(sio, app)
@@ -34,190 +82,169 @@ socket_app = socketio.ASGIApp(sio, app)
 async def health_check():
     return {"status": "ok"}
 
+async def _err(sid: str, code: str, message: str):
+    """Send a room:error with a per-call message to one client"""
+    await _emit('room:error', {'code': code, 'message': message}, room=sid)
+
+def _is_int(value) -> bool:
+    """JSON integers only; bool is an int subclass but never a valid amount, card or seq"""
+    return type(value) is int
+
+def _get_seq(data):
+    """Client seq from an action payload: None when absent, False when malformed"""
+    seq = data.get('seq') if isinstance(data, dict) else None
+    if seq is None or _is_int(seq):
+        return seq
+    return False
+
 @sio.event
 async def connect(sid, environ):
-    print(f"Client connected: {sid}")
+    logger.info("Client connected: %s", sid)
 
 @sio.event
 async def disconnect(sid):
-    print(f"Client disconnected: {sid}")
+    logger.info("Client disconnected: %s", sid)
     await game_manager.handle_disconnect(sid, sio)
 
 @sio.event
 async def create_room(sid, data):
-    try:
-        nickname = data.get('nickname')
-        if not nickname:
-            await sio.emit('room:error', {'code': 'INVALID_DATA', 'message': 'Nickname required'}, room=sid)
-            return
-        
-        room_id = await game_manager.create_room(sid, nickname)
-        await sio.enter_room(sid, room_id)
-        await sio.emit('room:created', {'roomId': room_id}, room=sid)
-        await game_manager.broadcast_state(room_id, sio)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'CREATE_FAILED', 'message': str(e)}, room=sid)
+    nickname = data.get('nickname')
+    if not nickname:
+        await _emit('room:error', ERR_INVALID_NICK, room=sid)
+        return
+    
+    room_id = await game_manager.create_room(sid, nickname)
+    # Enter the Socket.IO room before anything can yield, so no room:state goes out without us
+    await sio.enter_room(sid, room_id)
+    await _emit('room:created', {'roomId': room_id}, room=sid)
+    game_manager.schedule_broadcast(room_id)
 
 @sio.event
 async def join_room(sid, data):
     try:
-        print(f"Client {sid}, data {data} attempting to join room")
+        logger.debug("Client %s, data %s attempting to join room", sid, data)
         room_id = data.get('roomId')
         nickname = data.get('nickname')
         
         if not room_id or not nickname:
-            await sio.emit('room:error', {'code': 'INVALID_DATA', 'message': 'Room ID and nickname required'}, room=sid)
+            await _emit('room:error', ERR_INVALID_JOIN, room=sid)
             return
         
-        success = await game_manager.join_room(sid, room_id, nickname)
-        print(f"Client {sid}, success {success}")
-        if success:
-            await sio.enter_room(sid, room_id)
-            await sio.emit('room:joined', {'roomId': room_id}, room=sid)
-            await game_manager.broadcast_state(room_id, sio)
-        else:
-            await sio.emit('room:error', {'code': 'JOIN_FAILED', 'message': 'Could not join room'}, room=sid)
-        print("join done")
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'JOIN_FAILED', 'message': str(e)}, room=sid)
+        await game_manager.join_room(sid, room_id, nickname)
+        await sio.enter_room(sid, room_id)
+        await _emit('room:joined', {'roomId': room_id}, room=sid)
+        game_manager.schedule_broadcast(room_id)
+    except GameError as e:
+        await _err(sid, e.code, e.message)
 
 @sio.event
 async def player_ready(sid, data):
-    try:
-        ready = data.get('ready', False)
-        room_id = await game_manager.set_player_ready(sid, ready)
-        if room_id:
-            await game_manager.broadcast_state(room_id, sio)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'READY_FAILED', 'message': str(e)}, room=sid)
+    ready = data.get('ready', False)
+    room_id = await game_manager.set_player_ready(sid, ready)
+    if room_id:
+        game_manager.schedule_broadcast(room_id)
 
 @sio.event
 async def start_game(sid, data):
     try:
         room_id = await game_manager.start_game(sid)
         if room_id:
-            await game_manager.broadcast_state(room_id, sio)
-        else:
-            await sio.emit('room:error', {'code': 'START_FAILED', 'message': '게임을 시작할 수 없습니다. 3명 이상 참여, 모든 일반 플레이어 준비 완료 필요'}, room=sid)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'START_FAILED', 'message': str(e)}, room=sid)
+            game_manager.schedule_broadcast(room_id)
+    except GameError as e:
+        await _err(sid, e.code, e.message)
 
 @sio.event
 async def place_bid(sid, data):
+    amount = data.get('amount') if isinstance(data, dict) else None
+    if not _is_int(amount):
+        await _emit('room:error', ERR_INVALID_BID, room=sid)
+        return
+    seq = _get_seq(data)
+    if seq is False:
+        await _emit('room:error', ERR_INVALID_SEQ, room=sid)
+        return
+    
     try:
-        amount = data.get('amount')
-        if amount is None:
-            await sio.emit('room:error', {'code': 'INVALID_BID', 'message': 'Bid amount required'}, room=sid)
-            return
-        
-        room_id = await game_manager.handle_bid(sid, amount)
-        if room_id:
-            await game_manager.broadcast_state(room_id, sio)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'BID_FAILED', 'message': str(e)}, room=sid)
+        # Bids are pushed to the room as 'room:delta' events by the game manager
+        await game_manager.handle_bid(sid, amount, seq)
+    except GameError as e:
+        await _err(sid, e.code, e.message)
 
 @sio.event
 async def pass_turn(sid, data):
+    seq = _get_seq(data)
+    if seq is False:
+        await _emit('room:error', ERR_INVALID_SEQ, room=sid)
+        return
+    
     try:
-        room_id = await game_manager.handle_pass(sid)
-        if room_id:
-            await game_manager.broadcast_state(room_id, sio)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'PASS_FAILED', 'message': str(e)}, room=sid)
+        # Passes are pushed to the room as 'room:delta' events by the game manager
+        await game_manager.handle_pass(sid, seq)
+    except GameError as e:
+        await _err(sid, e.code, e.message)
 
 @sio.event
-async def chat_message(sid, data):
-    try:
-        message = data.get('message')
-        if not message:
-            return
-        
-        # 플레이어가 속한 방 찾기
-        room_id = game_manager.player_to_room.get(sid)
-        if not room_id:
-            return
-        
-        # 플레이어 정보 가져오기
-        room = game_manager.rooms.get(room_id)
-        if not room:
-            return
-        
-        player = room.players.get(sid)
-        if not player:
-            return
-        
-        # 채팅 메시지를 방의 모든 플레이어에게 브로드캐스트
-        import time
-        chat_data = {
-            'playerId': sid,
-            'nickname': player.nickname,
-            'message': message,
-            'timestamp': int(time.time() * 1000)
-        }
-        
-        print(f"Broadcasting chat message from {player.nickname}: {message}")
-        await sio.emit('chat:message', chat_data, room=room_id)
-    except Exception as e:
-        print(f"Chat message error: {e}")
-        await sio.emit('room:error', {'code': 'CHAT_FAILED', 'message': str(e)}, room=sid)
+async def request_state(sid, data):
+    # Full snapshot for clients whose local mirror fell out of sync with the deltas
+    room = _sid_to_room.get(sid)
+    if room:
+        room.last_activity = time.monotonic()
+        await game_manager.send_state(room.room_id, sid, sio)
 
 @sio.event
 async def leave_room(sid, data):
-    try:
-        # 소켓 룸에서 먼저 제거
-        room_id = game_manager.player_to_room.get(sid)
-        if room_id:
-            await sio.leave_room(sid, room_id)
-        
-        await game_manager.handle_disconnect(sid, sio)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'LEAVE_FAILED', 'message': str(e)}, room=sid)
-        
+    # 소켓 룸에서 먼저 제거 - 떠나는 플레이어는 room:destroyed를 받지 않도록
+    room = _sid_to_room.get(sid)
+    if room:
+        await sio.leave_room(sid, room.room_id)
+    
+    await game_manager.handle_disconnect(sid, sio)
+
 @sio.event
 async def play_card(sid, data):
+    card_id = data.get('card_id') if isinstance(data, dict) else None
+    if not _is_int(card_id):
+        await _emit('room:error', ERR_INVALID_CARD, room=sid)
+        return
+    
     try:
-        card_id = data.get('card_id')
-        if card_id is None:
-            await sio.emit('room:error', {'code': 'INVALID_CARD', 'message': 'Card ID required'}, room=sid)
-            return
-        
         room_id = await game_manager.handle_play_card(sid, card_id)
         if room_id:
-            await game_manager.broadcast_state(room_id, sio)
-    except Exception as e:
-        await sio.emit('room:error', {'code': 'PLAY_FAILED', 'message': str(e)}, room=sid)
+            game_manager.schedule_broadcast(room_id)
+    except GameError as e:
+        await _err(sid, e.code, e.message)
 
 @sio.event
 async def chat_message(sid, data):
-    try:
-        message = data.get('message')
-        if not message:
-            return
-        
-        room_id = game_manager.player_to_room.get(sid)
-        if not room_id or room_id not in game_manager.rooms:
-            return
-        
-        room = game_manager.rooms[room_id]
-        player = room.players.get(sid)
-        if not player:
-            return
-        
-        # Broadcast chat message to all players in room
-        import time
-        chat_data = {
-            'playerId': sid,
-            'nickname': player.nickname,
-            'message': message,
-            'timestamp': int(time.time() * 1000)
-        }
-        await sio.emit('chat:message', chat_data, room=room_id)
-    except Exception as e:
-        print(f"Chat message error: {e}")
+    message = data.get('message')
+    if not message:
+        return
+    
+    room = _sid_to_room.get(sid)
+    if not room:
+        return
+    player = room.players.get(sid)
+    if not player:
+        return
+    
+    # Chat message for all players in room
+    chat_data = {
+        'playerId': sid,
+        'nickname': player.nickname,
+        'message': message,
+        'timestamp': _time_ns() // 1_000_000
+    }
+    # Buffered and sent with any other messages from this room as one chat:batch
+    game_manager.queue_chat(room, chat_data)
 
 # For Vercel deployment
 app = socket_app
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(socket_app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # uvloop has no Windows build, so local Windows runs stay on the stock asyncio loop
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    # Pins uvicorn's defaults (websockets backend, permessage-deflate on) so a version
+    # bump can't silently turn off compression of the repetitive room:state JSON
+    uvicorn.run(socket_app, host="0.0.0.0", port=port, loop=loop, http="httptools",
+                ws="websockets", ws_per_message_deflate=True)
\ No newline at end of file